@@ -4,16 +4,92 @@ Improved parser with flexible recognition and multi-format support
 """
 
 import re
+import sys
+import math
 import logging
-from dataclasses import dataclass, asdict, field
-from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Tuple
 from enum import Enum
-from datetime import datetime
+from functools import lru_cache
 
-from config import Patterns
+from config import Patterns, HEBREW_WEEKDAYS, PARSE_CACHE_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Slotted dataclasses need Python 3.10+; older interpreters keep per-instance dicts
+DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Single-character normalization applied by _clean_text in one pass
+CLEAN_TEXT_TABLE = str.maketrans({
+    "\r": " ",
+    "\uFEFF": "",
+    "\xa0": " ",
+    "\u200E": "",   # left-to-right mark
+    "\u200F": "",   # right-to-left mark
+    "״": '"',
+    "׳": "'",
+})
+
+# Metadata field patterns, compiled once and tried in order on each header line
+METADATA_PATTERNS = {
+    'total_hours': [
+        re.compile(r"(?:סה[\"']כ\s*שעות|Total\s*Hours|סך\s*הכל\s*שעות)[:\s]*([\d.]+)", re.IGNORECASE),
+        re.compile(r"(?:ימים|Days)[:\s]*(\d+)", re.IGNORECASE),
+    ],
+    'total_salary': [
+        re.compile(r"(?:סה[\"']כ\s*לתשלום|Total|סך\s*לתשלום)[:\s]*[₪$]?\s*([\d,]+\.?\d*)", re.IGNORECASE),
+        re.compile(r"[₪$]\s*([\d,]+\.?\d*)", re.IGNORECASE),
+    ],
+    'hourly_rate': [
+        re.compile(r"(?:מחיר\s*לשעה|Hourly\s*Rate|תעריף)[:\s]*[₪$]?\s*([\d.]+)", re.IGNORECASE),
+    ],
+    'required_hours': [
+        re.compile(r"(?:שעות\s*עבודה\s*למשרה|Required\s*Hours|שעות\s*נדרשות)[:\s]*([\d.]+)", re.IGNORECASE),
+    ],
+    # Anchored: on a single line every match can start at 0, and an unanchored
+    # lazy .*? retries from every offset (quadratic on long non-matching lines)
+    'company_name': [
+        re.compile(r"^(.*?בע[״\"'\']מ.*?)(?:\n|\s{3,})", re.IGNORECASE),
+        re.compile(r"^(.*?Ltd\..*?)(?:\n|\s{3,})", re.IGNORECASE),
+    ]
+}
+
+
+@lru_cache(maxsize=1024)
+def _tokenize_row(line: str) -> Optional[Tuple[str, Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    Split a merged row into its date, times and decimals
+
+    Returns None for rows without a date or without a start/end time pair.
+    Cached so the generic fallback does not re-scan rows it already tried.
+    """
+    # A row needs two HH:MM times and a date separator - reject the rest
+    # with substring tests before running any regex
+    if ":" not in line or ("/" not in line and "." not in line and "-" not in line):
+        return None
+    date_match = Patterns.DATE_RE.search(line)
+    if not date_match:
+        return None
+    times = Patterns.TIME_RE.findall(line)
+    if len(times) < 2:
+        return None
+    return date_match.group(1), tuple(times), tuple(Patterns.DECIMAL_RE.findall(line))
+
+
+@lru_cache(maxsize=256)
+def _count_line_tokens(line: str) -> Tuple[int, int, int]:
+    """
+    Count dates, times and decimals in a header line
+
+    Shared by the column estimate and the line-pattern guess in
+    _identify_template, which both look at the first lines of the report.
+    """
+    return (
+        len(Patterns.DATE_RE.findall(line)),
+        len(Patterns.TIME_RE.findall(line)),
+        len(Patterns.DECIMAL_RE.findall(line)),
+    )
+
 
 class TemplateType(Enum):
     """Report template types"""
@@ -22,7 +98,7 @@ class TemplateType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class AttendanceRecord:
     """Basic attendance record"""
     date: str
@@ -34,7 +110,7 @@ class AttendanceRecord:
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class DetailedAttendanceRecord(AttendanceRecord):
     """Detailed attendance record"""
     location: Optional[str] = None
@@ -45,7 +121,7 @@ class DetailedAttendanceRecord(AttendanceRecord):
     saturday: Optional[float] = None   # Saturday hours
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ReportMetadata:
     """Report metadata"""
     employee_name: Optional[str] = None
@@ -61,7 +137,7 @@ class ReportMetadata:
     top_table_rows: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ParsedReport:
     """Fully parsed report"""
     metadata: ReportMetadata
@@ -75,9 +151,10 @@ class AttendanceParser:
 
     def __init__(self, text: str):
         self.text = self._clean_text(text)
-        self.lines = [l.strip() for l in self.text.split("\n") if l.strip()]
+        self.lines = [line for raw in self.text.split("\n") if (line := raw.strip())]
         self.metadata = ReportMetadata()
         self.records: List[AttendanceRecord] = []
+        self._merged_lines: Optional[List[str]] = None
 
     def parse(self) -> ParsedReport:
         """Perform full report parsing"""
@@ -116,49 +193,58 @@ class AttendanceParser:
     def _identify_template(self) -> TemplateType:
         """Improved template type identification"""
 
-        # Method 1: keyword count
-        detailed_count = sum(
-            1 for pattern in Patterns.DETAILED_KEYWORDS
-            if re.search(pattern, self.text, re.IGNORECASE)
-        )
-
-        simple_count = sum(
-            1 for pattern in Patterns.SIMPLE_KEYWORDS
-            if re.search(pattern, self.text, re.IGNORECASE)
-        )
-
-        logger.debug(f"Keyword counts - Detailed: {detailed_count}, Simple: {simple_count}")
+        # Each method returns as soon as it decides the type
+        # Method 1: detailed keyword count
+        # (separate literal searches measured faster than one fused
+        # alternation, which loses the literal-prefix scan and visits every hit)
+        detailed_count = self._count_keywords(Patterns.DETAILED_KEYWORDS_RE, stop_at=3)
+        logger.debug("Detailed keyword count: %d", detailed_count)
+        if detailed_count >= 3:
+            return TemplateType.DETAILED
 
         # Method 2: structure analysis - column count estimation
+        # (a wide table wins over simple keywords, so this must come first)
         column_count = self._estimate_column_count()
-        logger.debug(f"Estimated columns: {column_count}")
-
-        # Decision logic
-        if detailed_count >= 3 or column_count >= 10:
+        logger.debug("Estimated columns: %d", column_count)
+        if column_count >= 10:
             return TemplateType.DETAILED
-        elif simple_count >= 2 or (5 <= column_count <= 7):
+
+        # Method 3: simple keyword count
+        simple_count = self._count_keywords(Patterns.SIMPLE_KEYWORDS_RE, stop_at=2)
+        logger.debug("Simple keyword count: %d", simple_count)
+        if simple_count >= 2 or (5 <= column_count <= 7):
             return TemplateType.SIMPLE
 
         # Try to guess based on line patterns
         for line in self.lines[:30]:
-            times = re.findall(Patterns.TIME, line)
-            decimals = re.findall(Patterns.DECIMAL, line)
+            # Both outcomes need two times - lines without a colon cannot match
+            if ":" not in line:
+                continue
+            _, times, decimals = _count_line_tokens(line)
 
-            if len(times) >= 2 and len(decimals) >= 4:
+            if times >= 2 and decimals >= 4:
                 return TemplateType.DETAILED
-            elif len(times) >= 2 and len(decimals) >= 1:
+            elif times >= 2 and decimals >= 1:
                 return TemplateType.SIMPLE
 
         return TemplateType.UNKNOWN
 
+    def _count_keywords(self, patterns, stop_at: int) -> int:
+        """Count keywords present in the text, stopping once stop_at is reached"""
+        count = 0
+        for pattern in patterns:
+            if pattern.search(self.text):
+                count += 1
+                if count >= stop_at:
+                    break
+        return count
+
     def _estimate_column_count(self) -> int:
         """Estimate number of columns from first lines"""
         max_elements = 0
 
         for line in self.lines[:20]:
-            dates = len(re.findall(Patterns.DATE, line))
-            times = len(re.findall(Patterns.TIME, line))
-            decimals = len(re.findall(Patterns.DECIMAL, line))
+            dates, times, decimals = _count_line_tokens(line)
             words = len([w for w in line.split() if len(w) > 1])
 
             elements = dates + times + decimals + min(words, 3)
@@ -168,53 +254,40 @@ class AttendanceParser:
 
     def _extract_metadata(self):
         """Enhanced metadata extraction"""
-        patterns = {
-            'total_hours': [
-                r"(?:סה[\"']כ\s*שעות|Total\s*Hours|סך\s*הכל\s*שעות)[:\s]*([\d.]+)",
-                r"(?:ימים|Days)[:\s]*(\d+)",
-            ],
-            'total_salary': [
-                r"(?:סה[\"']כ\s*לתשלום|Total|סך\s*לתשלום)[:\s]*[₪$]?\s*([\d,]+\.?\d*)",
-                r"[₪$]\s*([\d,]+\.?\d*)",
-            ],
-            'hourly_rate': [
-                r"(?:מחיר\s*לשעה|Hourly\s*Rate|תעריף)[:\s]*[₪$]?\s*([\d.]+)",
-            ],
-            'required_hours': [
-                r"(?:שעות\s*עבודה\s*למשרה|Required\s*Hours|שעות\s*נדרשות)[:\s]*([\d.]+)",
-            ],
-            'company_name': [
-                r"(.*?בע[״\"'\']מ.*?)(?:\n|\s{3,})",
-                r"(.*?Ltd\..*?)(?:\n|\s{3,})",
-            ]
-        }
-
-        # Search in the first lines
+        # Search in the first lines, dropping each field once it is filled
+        remaining = [key for key in METADATA_PATTERNS if not getattr(self.metadata, key)]
         for line in self.lines[:25]:
-            for key, pattern_list in patterns.items():
-                for pattern in pattern_list:
-                    match = re.search(pattern, line, re.IGNORECASE)
+            if not remaining:
+                break
+            for key in tuple(remaining):
+                for pattern in METADATA_PATTERNS[key]:
+                    match = pattern.search(line)
                     if match:
                         value = match.group(1)
-                        if key == 'total_hours' and not self.metadata.total_hours:
+                        if key == 'total_hours':
                             self.metadata.total_hours = self._safe_float(value)
-                        elif key == 'total_salary' and not self.metadata.total_salary:
-                            self.metadata.total_salary = self._safe_float(value.replace(",", ""))
-                        elif key == 'hourly_rate' and not self.metadata.hourly_rate:
+                        elif key == 'total_salary':
+                            self.metadata.total_salary = self._safe_float(value)
+                        elif key == 'hourly_rate':
                             self.metadata.hourly_rate = self._safe_float(value)
-                        elif key == 'required_hours' and not self.metadata.required_hours:
+                        elif key == 'required_hours':
                             self.metadata.required_hours = self._safe_float(value)
-                        elif key == 'company_name' and not self.metadata.company_name:
+                        elif key == 'company_name':
                             self.metadata.company_name = value.strip()
 
+                        if getattr(self.metadata, key):
+                            remaining.remove(key)
+                            break
+
         self._extract_month_year()
 
     def _extract_month_year(self):
         """Extract month and year from dates"""
-        dates = re.findall(Patterns.DATE, self.text)
-        if dates:
+        # Only the first date is used - stop scanning at the first hit
+        date_match = Patterns.DATE_RE.search(self.text)
+        if date_match:
             try:
-                first_date = dates[0]
+                first_date = date_match.group(1)
                 normalized = first_date.replace(".", "/").replace("-", "/")
                 parts = normalized.split("/")
 
@@ -231,7 +304,7 @@ class AttendanceParser:
                     else:
                         self.metadata.year = year
             except Exception as e:
-                logger.debug(f"Could not parse date: {e}")
+                logger.debug("Could not parse date: %s", e)
 
     def _parse_simple_records_flexible(self):
         """Flexible parsing for simple template"""
@@ -240,18 +313,19 @@ class AttendanceParser:
 
         logger.info("Parsing simple records with flexible method")
 
-        for line in merged_lines:
-            date_match = re.search(Patterns.DATE, line)
-            if not date_match:
-                continue
-            date = date_match.group(1)
-            day = self._extract_day(line)
-            times = re.findall(Patterns.TIME, line)
-            if len(times) < 2:
-                continue
+        # Bind per-row lookups to locals once, outside the loop
+        tokenize_row = _tokenize_row
+        extract_day = self._extract_day
+        safe_float = self._safe_float
+        append_record = self.records.append
+
+        # Rows without a date or time pair are dropped by filter() before
+        # entering the loop; the second tokenize_row call is a cache hit
+        for line in filter(tokenize_row, merged_lines):
+            date, times, decimals = tokenize_row(line)
+            day = extract_day(line)
             start_time, end_time = times[:2]
-            decimals = re.findall(Patterns.DECIMAL, line)
-            total = self._safe_float(decimals[-1]) if decimals else None
+            total = safe_float(decimals[-1]) if decimals else None
 
             record = AttendanceRecord(
                 date=date,
@@ -262,7 +336,7 @@ class AttendanceParser:
                 total=total
             )
 
-            self.records.append(record)
+            append_record(record)
 
     def _parse_detailed_records_flexible(self):
         """Flexible parsing for detailed template"""
@@ -271,19 +345,22 @@ class AttendanceParser:
 
         logger.info("Parsing detailed records with flexible method")
 
-        for line in merged_lines:
-            date_match = re.search(Patterns.DATE, line)
-            if not date_match:
-                continue
-            date = date_match.group(1)
-            day = self._extract_day(line)
-            times = re.findall(Patterns.TIME, line)
-            if len(times) < 2:
-                continue
+        # Bind per-row lookups to locals once, outside the loop
+        tokenize_row = _tokenize_row
+        extract_day = self._extract_day
+        extract_location = self._extract_location
+        safe_float = self._safe_float
+        append_record = self.records.append
+
+        # Rows without a date or time pair are dropped by filter() before
+        # entering the loop; the second tokenize_row call is a cache hit
+        for line in filter(tokenize_row, merged_lines):
+            date, times, decimals = tokenize_row(line)
+            day = extract_day(line)
             start_time, end_time = times[:2]
             break_time = times[2] if len(times) >= 3 else None
-            decimals = re.findall(Patterns.DECIMAL, line)
-            location = self._extract_location(line, day)
+            location = extract_location(line, day)
+            total = safe_float(decimals[0]) if decimals else None
 
             record = DetailedAttendanceRecord(
                 date=date,
@@ -292,15 +369,15 @@ class AttendanceParser:
                 start_time=start_time,
                 end_time=end_time,
                 break_time=break_time,
-                total=self._safe_float(decimals[0]) if len(decimals) > 0 else None,
-                hours_100=self._safe_float(decimals[1]) if len(decimals) > 1 else None,
-                hours_125=self._safe_float(decimals[2]) if len(decimals) > 2 else None,
-                hours_150=self._safe_float(decimals[3]) if len(decimals) > 3 else None,
-                saturday=self._safe_float(decimals[4]) if len(decimals) > 4 else None,
-                hours=self._safe_float(decimals[0]) if len(decimals) > 0 else None
+                total=total,
+                hours_100=safe_float(decimals[1]) if len(decimals) > 1 else None,
+                hours_125=safe_float(decimals[2]) if len(decimals) > 2 else None,
+                hours_150=safe_float(decimals[3]) if len(decimals) > 3 else None,
+                saturday=safe_float(decimals[4]) if len(decimals) > 4 else None,
+                hours=total
             )
 
-            self.records.append(record)
+            append_record(record)
 
     def _parse_flexible_generic(self):
         """Generic fallback parsing when template type is unknown"""
@@ -310,14 +387,22 @@ class AttendanceParser:
             self._parse_detailed_records_flexible()
 
     def _extract_day(self, line: str) -> str:
-        """Extract weekday from line"""
-        hebrew_match = re.search(Patterns.HEBREW_DAY, line)
+        """Extract weekday from line (interned - a report repeats ~7 values)"""
+        # Fast path: a full weekday name that is the first non-ASCII token is
+        # exactly what the Hebrew regex below would return
+        for token in line.split():
+            if token in HEBREW_WEEKDAYS:
+                return sys.intern(token)
+            if not token.isascii():
+                break
+
+        hebrew_match = Patterns.HEBREW_DAY_RE.search(line)
         if hebrew_match:
-            return hebrew_match.group(1)
+            return sys.intern(hebrew_match.group(1))
 
-        english_match = re.search(Patterns.ENGLISH_DAY, line, re.IGNORECASE)
+        english_match = Patterns.ENGLISH_DAY_RE.search(line)
         if english_match:
-            return english_match.group(1)
+            return sys.intern(english_match.group(1))
         return ""
 
     def _extract_location(self, line: str, day: str) -> str:
@@ -327,31 +412,33 @@ class AttendanceParser:
         day_pos = line.find(day)
         if day_pos == -1:
             return ""
-        after_day = line[day_pos + len(day):].strip()
-        words = after_day.split()
-        if words and len(words[0]) <= 6 and not re.match(r'\d{1,2}:\d{2}', words[0]):
-            return words[0]
+        # Match in place after the day instead of slicing and splitting the rest
+        location_match = Patterns.LOCATION_RE.match(line, day_pos + len(day))
+        if location_match:
+            return sys.intern(location_match.group(1))
         return ""
 
     def _merge_broken_lines(self) -> List[str]:
-        """Merge broken lines that were split mid-row"""
-        merged = []
-        buffer = ""
-        for line in self.lines:
-            if re.match(Patterns.DATE, line):
-                if buffer:
-                    merged.append(buffer.strip())
-                buffer = line
-            else:
-                buffer += " " + line
-        if buffer:
-            merged.append(buffer.strip())
-        return merged
+        """Merge broken lines that were split mid-row (computed once per parser)"""
+        if self._merged_lines is None:
+            self._merged_lines = self._split_rows()
+        return self._merged_lines
+
+    def _split_rows(self) -> List[str]:
+        """Split the cleaned lines into one string per attendance row"""
+        # No date anywhere means no row can match - skip the per-row work
+        if not self.lines or not Patterns.DATE_RE.search(self.text):
+            return []
+        # Split once at every line that starts with a date, then glue the
+        # continuation lines of each row back together
+        joined = "\n".join(self.lines)
+        return [row.replace("\n", " ") for row in Patterns.ROW_BREAK_RE.split(joined)]
 
     def _calculate_totals(self):
         """Compute totals if missing"""
         if not self.metadata.total_hours and self.records:
-            total = sum(r.hours for r in self.records if r.hours)
+            # fsum keeps the running total exact across many 2-decimal values
+            total = math.fsum(r.hours for r in self.records if r.hours)
             self.metadata.total_hours = round(total, 2)
 
         if not self.metadata.total_salary and self.metadata.hourly_rate and self.metadata.total_hours:
@@ -363,13 +450,13 @@ class AttendanceParser:
         """Clean text from special characters"""
         if not text:
             return ""
-        text = text.replace("\r", " ").replace("\uFEFF", "").replace("\xa0", " ")
-        text = text.replace("״", '"').replace("׳", "'")
-        text = re.sub(r"[ \t]+", " ", text)
-        text = re.sub(r"\n{3,}", "\n\n", text)
+        text = text.translate(CLEAN_TEXT_TABLE)
+        text = Patterns.SPACES_RE.sub(" ", text)
+        text = Patterns.BLANK_LINES_RE.sub("\n\n", text)
         return text.strip()
 
-    def _safe_float(self, value: str, default: float = 0.0) -> float:
+    @staticmethod
+    def _safe_float(value: str, default: float = 0.0) -> float:
         """Safely convert to float"""
         if not value:
             return default
@@ -380,9 +467,24 @@ class AttendanceParser:
             return default
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(text: str) -> ParsedReport:
+    """Parse once per input text - callers only ever see copies"""
+    parser = AttendanceParser(text)
+    return parser.parse()
+
+
 def parse_attendance_report(text: str) -> ParsedReport:
     """
     Entry point for parsing attendance report text
+
+    Parsing is deterministic, so results are memoized per input text.
+    Each call gets its own copy, so edits never leak into the cache.
     """
-    parser = AttendanceParser(text)
-    return parser.parse()
\ No newline at end of file
+    report = _parse_cached(text)
+    metadata = report.metadata
+    return replace(
+        report,
+        metadata=replace(metadata, top_table_rows=list(metadata.top_table_rows)),
+        records=[replace(record) for record in report.records]
+    )
\ No newline at end of file
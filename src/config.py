@@ -3,6 +3,7 @@ config.py - Configuration File
 Central configuration file for the system
 """
 
+import re
 from pathlib import Path
 
 # ========== PATHS ==========
@@ -12,9 +13,6 @@ INPUT_DIR = BASE_DIR / "input"
 OUTPUT_DIR = BASE_DIR / "output"
 FONTS_DIR = BASE_DIR / "fonts"
 
-INPUT_DIR.mkdir(exist_ok=True)
-OUTPUT_DIR.mkdir(exist_ok=True)
-
 # ========== PDF SETTINGS ==========
 
 PAGE_SIZES = {
@@ -41,6 +39,7 @@ DATE_FORMATS = [
 ]
 
 TIME_FORMAT = "%H:%M"
+HEBREW_WEEKDAYS = frozenset({"ראשון", "שני", "שלישי", "רביעי", "חמישי", "שישי", "שבת"})
 REGEX_TIMEOUT = 5
 
 # ========== VARIATION SETTINGS ==========
@@ -72,15 +71,15 @@ FONT_SEARCH_PATHS = [
     "/usr/share/fonts/truetype/dejavu/",
     "/usr/share/fonts/truetype/noto/",
     "/System/Library/Fonts/",
-    "/Library/Fonts/",
     "C:/Windows/Fonts/",
-    str(FONTS_DIR)
+    "./fonts/"
 ]
 
 FONT_MAPPINGS = {
     "Arial": ["Arial.ttf", "LiberationSans-Regular.ttf", "DejaVuSans.ttf"],
     "Arial-Bold": ["Arial-Bold.ttf", "LiberationSans-Bold.ttf", "DejaVuSans-Bold.ttf"],
     "Times-Roman": ["Times-Roman.ttf", "LiberationSerif-Regular.ttf", "DejaVuSerif.ttf"],
+    "Times-Bold": ["Times-Bold.ttf", "LiberationSerif-Bold.ttf", "DejaVuSerif-Bold.ttf"],
     "Courier": ["Courier.ttf", "LiberationMono-Regular.ttf", "DejaVuSansMono.ttf"]
 }
 
@@ -122,6 +121,9 @@ LOG_FILE = OUTPUT_DIR / "processing.log"
 MAX_PAGES_FOR_STRUCTURE = 3
 PDF_READ_TIMEOUT = 30
 TEXT_BUFFER_SIZE = 1000000
+PARSE_CACHE_SIZE = 16
+CACHE_EXTRACTED_TEXT = False
+TEXT_CACHE_DIR = OUTPUT_DIR / ".cache"
 
 # ========== DEVELOPMENT SETTINGS ==========
 
@@ -129,8 +131,14 @@ DEBUG_MODE = False
 SAVE_INTERMEDIATE_FILES = False
 INTERMEDIATE_DIR = OUTPUT_DIR / "intermediate"
 
-if SAVE_INTERMEDIATE_FILES:
-    INTERMEDIATE_DIR.mkdir(exist_ok=True)
+
+def ensure_dirs():
+    """Create the working directories (called by the CLI, not at import)"""
+    INPUT_DIR.mkdir(exist_ok=True)
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    if SAVE_INTERMEDIATE_FILES:
+        INTERMEDIATE_DIR.mkdir(exist_ok=True)
+
 
 # ========== PATTERNS ==========
 
@@ -146,9 +154,28 @@ class Patterns:
     HEBREW_DAY = r'([א-ת]{2,6}י?\'?)'
     ENGLISH_DAY = r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday|Mon|Tue|Wed|Thu|Fri|Sat|Sun)'
 
+    # Pre-compiled variants used in per-line loops
+    DATE_RE = re.compile(DATE)
+    TIME_RE = re.compile(TIME)
+    DECIMAL_RE = re.compile(DECIMAL)
+    HEBREW_DAY_RE = re.compile(HEBREW_DAY)
+    ENGLISH_DAY_RE = re.compile(ENGLISH_DAY, re.IGNORECASE)
+
+    # Line break followed by a date - the start of a new attendance row
+    ROW_BREAK_RE = re.compile(r'\n(?=\d{1,2}[\/\.\-]\d{1,2}[\/\.\-]\d{2,4})')
+
+    # Location: first word (up to 6 chars, not a time) after the day name
+    LOCATION_RE = re.compile(r'\s*(?!\d{1,2}:\d{2})(\S{1,6})(?!\S)')
+
+    # Whitespace normalization
+    SPACES_RE = re.compile(r'[ \t]+')
+    BLANK_LINES_RE = re.compile(r'\n{3,}')
+
     # Keywords from template configuration
     DETAILED_KEYWORDS = TEMPLATE_KEYWORDS["detailed"]
     SIMPLE_KEYWORDS = TEMPLATE_KEYWORDS["simple"]
+    DETAILED_KEYWORDS_RE = [re.compile(p, re.IGNORECASE) for p in DETAILED_KEYWORDS]
+    SIMPLE_KEYWORDS_RE = [re.compile(p, re.IGNORECASE) for p in SIMPLE_KEYWORDS]
 
 
 if __name__ == "__main__":
@@ -3,16 +3,34 @@ data_generator.py - Attendance Data Variation Generator
 Generates logical variations of attendance data
 """
 
+import re
+import math
 import random
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from copy import deepcopy
-from dataclasses import asdict
-from config import TIME_VARIATIONS
+from functools import lru_cache
+from typing import Dict, Any
+from dataclasses import replace
+from config import TIME_VARIATIONS, TIME_BOUNDS
 
 logger = logging.getLogger(__name__)
 
+MINUTES_PER_DAY = 24 * 60
+
+# Same field rules as strptime's %H and %M directives
+HM_RE = re.compile(r"(2[0-3]|[0-1]\d|\d):([0-5]\d|\d)")
+
+# Every minute of the day as HH:MM, indexed by minutes since midnight
+HM_STRINGS = tuple(f"{m // 60:02d}:{m % 60:02d}" for m in range(MINUTES_PER_DAY))
+
+
+@lru_cache(maxsize=MINUTES_PER_DAY)
+def _hm_to_min(time_str: str) -> int:
+    """Parse HH:MM into minutes since midnight (accepts exactly what strptime's %H:%M does)"""
+    match = HM_RE.fullmatch(time_str)
+    if not match:
+        raise ValueError(f"time data {time_str!r} does not match format '%H:%M'")
+    return int(match.group(1)) * 60 + int(match.group(2))
+
 
 class VariationLevel:
     """Levels of variation"""
@@ -33,6 +51,16 @@ class AttendanceVariationGenerator:
             self.TIME_VARIATIONS[VariationLevel.MODERATE]
         )
 
+        # Clamp bounds in minutes since midnight - parsed once, not per record
+        self._start_bounds = (
+            _hm_to_min(TIME_BOUNDS["earliest_start"]),
+            _hm_to_min(TIME_BOUNDS["latest_start"])
+        )
+        self._end_bounds = (
+            _hm_to_min(TIME_BOUNDS["earliest_end"]),
+            _hm_to_min(TIME_BOUNDS["latest_end"])
+        )
+
     def generate_variation(self, parsed_report) -> Dict[str, Any]:
         """
         Generate a variation of a parsed report
@@ -45,46 +73,64 @@ class AttendanceVariationGenerator:
         """
         logger.info(f"Generating variation with level: {self.variation_level}")
 
-        # Deep copy to avoid modifying the original
-        varied_report = deepcopy(parsed_report)
-
-        # Modify each record
+        # Modify each record (each one is copied, the originals stay intact)
+        # Worked hours are collected on the way so totals need no second pass
         varied_records = []
-        for record in varied_report.records:
+        worked_hours = []
+        for record in parsed_report.records:
             varied_record = self._vary_record(record)
             varied_records.append(varied_record)
-
-        varied_report.records = varied_records
+            if varied_record.hours:
+                worked_hours.append(varied_record.hours)
+
+        # Records and metadata hold only flat values - a shallow copy of each
+        # is enough to leave the original report untouched
+        metadata = parsed_report.metadata
+        varied_report = replace(
+            parsed_report,
+            records=varied_records,
+            metadata=replace(metadata, top_table_rows=list(metadata.top_table_rows))
+        )
 
         # Update totals
-        self._recalculate_totals(varied_report)
+        self._recalculate_totals(varied_report, math.fsum(worked_hours))
 
         logger.info(f"✅ Generated variation with {len(varied_records)} records")
         return varied_report
 
     def _vary_record(self, record):
         """Modify a single record"""
-        varied = deepcopy(record)
+        varied = replace(record)
+
+        # Detailed records carry break/overtime columns - test the type once
+        detailed = hasattr(varied, 'break_time')
 
         # Modify start and end times
         if varied.start_time:
             varied.start_time = self._vary_time(
                 varied.start_time,
                 self.config["start_minutes"],
-                earliest="06:00",
-                latest="10:00"
+                *self._start_bounds
             )
 
         if varied.end_time:
-            varied.end_time = self._vary_time(
-                varied.end_time,
-                self.config["end_minutes"],
-                earliest=varied.start_time if varied.start_time else "14:00",
-                latest="23:00"
-            )
+            earliest_end, latest_end = self._end_bounds
+            try:
+                # End may not move before the (varied) start time
+                if varied.start_time:
+                    earliest_end = _hm_to_min(varied.start_time)
+            except ValueError as e:
+                logger.warning(f"Could not vary time {varied.end_time}: {e}")
+            else:
+                varied.end_time = self._vary_time(
+                    varied.end_time,
+                    self.config["end_minutes"],
+                    earliest_end,
+                    latest_end
+                )
 
         # Modify break time if present
-        if hasattr(varied, 'break_time') and varied.break_time:
+        if detailed and varied.break_time:
             varied.break_time = self._vary_break_time(
                 varied.break_time,
                 self.config["break_minutes"]
@@ -92,49 +138,42 @@ class AttendanceVariationGenerator:
 
         # Recalculate total hours
         if varied.start_time and varied.end_time:
-            break_hours = self._time_to_hours(varied.break_time) if hasattr(varied, 'break_time') and varied.break_time else 0
+            break_hours = self._time_to_hours(varied.break_time) if detailed and varied.break_time else 0
             total_hours = self._calculate_hours(varied.start_time, varied.end_time, break_hours)
             varied.hours = total_hours
             varied.total = total_hours
 
             # Update overtime percentages if detailed report
-            if hasattr(varied, 'hours_100'):
+            if detailed:
                 self._recalculate_percentages(varied)
 
         return varied
 
     def _vary_time(self, time_str: str, max_variation: int,
-                   earliest: str = "00:00", latest: str = "23:59") -> str:
+                   earliest_min: int = 0, latest_min: int = MINUTES_PER_DAY - 1) -> str:
         """
         Vary time within allowed range
 
         Args:
             time_str: Time in HH:MM format
             max_variation: Maximum variation in minutes
-            earliest: Earliest allowed time
-            latest: Latest allowed time
+            earliest_min: Earliest allowed time, in minutes since midnight
+            latest_min: Latest allowed time, in minutes since midnight
         """
         try:
-            time_obj = datetime.strptime(time_str, "%H:%M")
+            time_min = _hm_to_min(time_str)
 
-            # Add random variation
-            variation = random.randint(-max_variation, max_variation)
-            varied_time = time_obj + timedelta(minutes=variation)
+            # Add random variation (wrapping around midnight like a clock)
+            variation = random.randrange(-max_variation, max_variation + 1)
+            varied_min = (time_min + variation) % MINUTES_PER_DAY
 
             # Keep within allowed range
-            earliest_obj = datetime.strptime(earliest, "%H:%M")
-            latest_obj = datetime.strptime(latest, "%H:%M")
-
-            varied_hour_min = varied_time.hour * 60 + varied_time.minute
-            earliest_min = earliest_obj.hour * 60 + earliest_obj.minute
-            latest_min = latest_obj.hour * 60 + latest_obj.minute
+            if varied_min < earliest_min:
+                varied_min = earliest_min
+            elif varied_min > latest_min:
+                varied_min = latest_min
 
-            if varied_hour_min < earliest_min:
-                varied_time = earliest_obj
-            elif varied_hour_min > latest_min:
-                varied_time = latest_obj
-
-            return varied_time.strftime("%H:%M")
+            return HM_STRINGS[varied_min]
 
         except Exception as e:
             logger.warning(f"Could not vary time {time_str}: {e}")
@@ -143,29 +182,26 @@ class AttendanceVariationGenerator:
     def _vary_break_time(self, break_time: str, max_variation: int) -> str:
         """Modify break time"""
         try:
-            time_obj = datetime.strptime(break_time, "%H:%M")
-            variation = random.randint(-max_variation, max_variation)
-            varied = time_obj + timedelta(minutes=variation)
+            break_min = _hm_to_min(break_time)
+            variation = random.randrange(-max_variation, max_variation + 1)
+            varied_min = (break_min + variation) % MINUTES_PER_DAY
 
             # Break cannot be negative or longer than 2 hours
-            if varied.hour > 2:
-                varied = time_obj
+            if varied_min // 60 > 2:
+                varied_min = break_min
 
-            return varied.strftime("%H:%M")
+            return HM_STRINGS[varied_min]
         except Exception:
             return break_time
 
     def _calculate_hours(self, start: str, end: str, break_hours: float = 0) -> float:
         """Calculate number of working hours"""
         try:
-            start_obj = datetime.strptime(start, "%H:%M")
-            end_obj = datetime.strptime(end, "%H:%M")
-
-            # If end time is earlier than start, it means it passed midnight
-            if end_obj <= start_obj:
-                end_obj += timedelta(days=1)
+            start_min = _hm_to_min(start)
+            end_min = _hm_to_min(end)
 
-            duration = (end_obj - start_obj).total_seconds() / 3600
+            # An end time earlier than the start means the shift passed midnight
+            duration = ((end_min - start_min) % MINUTES_PER_DAY) / 60
             net_hours = max(0, duration - break_hours)
 
             return round(net_hours, 2)
@@ -176,42 +212,28 @@ class AttendanceVariationGenerator:
     def _time_to_hours(self, time_str: str) -> float:
         """Convert HH:MM to decimal hours"""
         try:
-            time_obj = datetime.strptime(time_str, "%H:%M")
-            return time_obj.hour + time_obj.minute / 60.0
-        except Exception:
+            return _hm_to_min(time_str) / 60
+        except (TypeError, ValueError):
             return 0.0
 
     def _recalculate_percentages(self, record):
         """Recalculate overtime percentages (100%, 125%, 150%)"""
-        total = record.total or 0
+        total = record.total or 0.0
 
         # Simple logic:
         # - Up to 9 hours = 100%
         # - 9–11 hours = 125%
         # - Above 11 = 150%
-        if total <= 9:
-            record.hours_100 = total
-            record.hours_125 = 0
-            record.hours_150 = 0
-        elif total <= 11:
-            record.hours_100 = 9
-            record.hours_125 = total - 9
-            record.hours_150 = 0
-        else:
-            record.hours_100 = 9
-            record.hours_125 = 2
-            record.hours_150 = total - 11
-
-        record.hours_100 = round(record.hours_100, 2)
-        record.hours_125 = round(record.hours_125, 2)
-        record.hours_150 = round(record.hours_150, 2)
-
-    def _recalculate_totals(self, report):
-        """Update report totals"""
+        # Each bucket is the total clamped to its band - no branching needed
+        record.hours_100 = round(min(total, 9.0), 2)
+        record.hours_125 = round(min(max(total - 9.0, 0.0), 2.0), 2)
+        record.hours_150 = round(max(total - 11.0, 0.0), 2)
+
+    def _recalculate_totals(self, report, total_hours: float):
+        """Update report totals from the summed record hours"""
         if not report.records:
             return
 
-        total_hours = sum(r.hours for r in report.records if r.hours)
         report.metadata.total_hours = round(total_hours, 2)
 
         if report.metadata.hourly_rate:
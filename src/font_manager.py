@@ -5,15 +5,25 @@ Handles font detection, registration, and RTL text processing for Hebrew/English
 
 import os
 import logging
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfbase import pdfmetrics
-from reportlab.lib.fonts import addMapping
 import arabic_reshaper
 from bidi.algorithm import get_display
 
+from config import FONT_SEARCH_PATHS, FONT_MAPPINGS
+
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=1024)
+def _reorder_rtl(text: str) -> str:
+    """Reshape and reorder RTL text (cached - the same labels repeat on every row)."""
+    reshaped_text = arabic_reshaper.reshape(text)
+    return get_display(reshaped_text)
+
+
 class FontManager:
     """Manages fonts for PDF generation with Hebrew and English support."""
 
@@ -38,31 +48,12 @@ class FontManager:
         self._setup_font_mappings()
 
     def _find_font_files(self) -> Dict[str, str]:
-        """Find available font files on the system."""
+        """Find available font files in the configured search paths."""
         font_paths = {}
 
-        # Common font locations
-        font_dirs = [
-            '/usr/share/fonts/truetype/liberation/',
-            '/usr/share/fonts/truetype/dejavu/',
-            '/usr/share/fonts/truetype/noto/',
-            '/System/Library/Fonts/',  # macOS
-            'C:/Windows/Fonts/',  # Windows
-            './fonts/',  # Local fonts directory
-        ]
-
-        # Font name mappings
-        font_mappings = {
-            'Arial': ['Arial.ttf', 'LiberationSans-Regular.ttf', 'DejaVuSans.ttf'],
-            'Arial-Bold': ['Arial-Bold.ttf', 'LiberationSans-Bold.ttf', 'DejaVuSans-Bold.ttf'],
-            'Times-Roman': ['Times-Roman.ttf', 'LiberationSerif-Regular.ttf', 'DejaVuSerif.ttf'],
-            'Times-Bold': ['Times-Bold.ttf', 'LiberationSerif-Bold.ttf', 'DejaVuSerif-Bold.ttf'],
-            'Courier': ['Courier.ttf', 'LiberationMono-Regular.ttf', 'DejaVuSansMono.ttf'],
-        }
-
-        for font_name, font_files in font_mappings.items():
+        for font_name, font_files in FONT_MAPPINGS.items():
             for font_file in font_files:
-                for font_dir in font_dirs:
+                for font_dir in FONT_SEARCH_PATHS:
                     font_path = os.path.join(font_dir, font_file)
                     if os.path.exists(font_path):
                         font_paths[font_name] = font_path
@@ -93,11 +84,8 @@ class FontManager:
             return text
 
         try:
-            # Reshape Arabic/Hebrew text
-            reshaped_text = arabic_reshaper.reshape(text)
-            # Apply bidirectional algorithm
-            bidi_text = get_display(reshaped_text)
-            return bidi_text
+            # Reshape Arabic/Hebrew text and apply bidirectional algorithm
+            return _reorder_rtl(text)
         except Exception as e:
             logger.warning(f"Error processing Hebrew text: {e}")
             return text
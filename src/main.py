@@ -14,7 +14,7 @@ from attendance_parser import parse_attendance_report
 from data_generator import create_variation, VariationLevel
 from pdf_writer import write_pdf
 
-from config import INPUT_DIR, OUTPUT_DIR
+from config import INPUT_DIR, OUTPUT_DIR, ensure_dirs
 
 # Logging setup
 logging.basicConfig(
@@ -232,6 +232,7 @@ def process_pdf(input_path: str = "input/attendance.pdf",
 
 def main():
     """Main entry point"""
+    ensure_dirs()
 
     # Defaults
     DEFAULT_INPUT = str(INPUT_DIR / "w.pdf")
@@ -3,17 +3,30 @@ pdf_reader.py - Unified PDF Reading Layer
 Unifies text extraction and structure analysis into a comprehensive module
 """
 
+import re
+import mmap
+import hashlib
 import logging
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 import fitz  # PyMuPDF
 from PyPDF2 import PdfReader
-import pdfplumber
+
+from config import MAX_PAGES_FOR_STRUCTURE, CACHE_EXTRACTED_TEXT, TEXT_CACHE_DIR, Patterns
 
 logger = logging.getLogger(__name__)
 
+# Single-character cleanup applied by _sanitize_text in one pass
+SANITIZE_TABLE = str.maketrans({"\r": " ", "\uFEFF": "", "\xa0": " "})
+# Two or more newlines in a row (Patterns.BLANK_LINES_RE only matches three or more)
+NEWLINE_RUN_RE = re.compile(r"\n{2,}")
+
+# Part of every text cache file name - bump it whenever _extract_text or
+# _sanitize_text changes its output, so stale cached text is never served
+TEXT_CACHE_VERSION = 1
+
 
 @dataclass
 class FontInfo:
@@ -81,29 +94,94 @@ class PDFReader:
         """
         logger.info(f"Reading PDF: {self.pdf_path}")
 
-        # Text extraction
-        text = self._extract_text()
-
-        # Get page count
-        page_count = self._get_page_count()
+        # Parse the PDF object graph once and share it with every PyMuPDF step
+        doc = self._open_document()
 
-        # Create basic content object
-        self.content = PDFContent(
-            file_path=str(self.pdf_path),
-            text=text,
-            page_count=page_count
-        )
-
-        # Analyze structure if requested
-        if analyze_structure:
-            structures = self._analyze_structure()
-            self.content.structures = structures
+        try:
+            # Text extraction (optionally served from the on-disk cache)
+            cache_path = self._text_cache_path() if CACHE_EXTRACTED_TEXT else None
+            text = self._load_cached_text(cache_path) if cache_path else None
+            if text is None:
+                text = self._extract_text(doc)
+                if cache_path and text:
+                    self._store_cached_text(cache_path, text)
+
+            # Get page count
+            page_count = self._get_page_count(doc)
+
+            # Create basic content object
+            self.content = PDFContent(
+                file_path=str(self.pdf_path),
+                text=text,
+                page_count=page_count
+            )
+
+            # Analyze structure if requested
+            if analyze_structure:
+                structures = self._analyze_structure(doc)
+                self.content.structures = structures
+        finally:
+            if doc is not None:
+                doc.close()
 
         logger.info(f"✅ PDF read successfully: {page_count} pages, {len(text)} chars")
         return self.content
 
-    def _extract_text(self) -> str:
+    def _open_document(self):
+        """Open the PDF with PyMuPDF, or return None if it cannot be opened"""
+        try:
+            return fitz.open(str(self.pdf_path))
+        except Exception as e:
+            logger.warning(f"PyMuPDF could not open PDF: {e}")
+            return None
+
+    def _text_cache_path(self) -> Optional[Path]:
+        """Cache file for this PDF, keyed by a hash of its contents, or None if unreadable"""
+        try:
+            data = self.pdf_path.read_bytes()
+        except OSError as e:
+            logger.warning(f"Could not hash PDF for the text cache: {e}")
+            return None
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return TEXT_CACHE_DIR / f"{digest}-v{TEXT_CACHE_VERSION}.txt"
+
+    def _load_cached_text(self, cache_path: Path) -> Optional[str]:
+        """Return previously extracted text for this PDF, or None"""
+        try:
+            text = cache_path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        logger.debug("Text loaded from cache")
+        return text
+
+    def _store_cached_text(self, cache_path: Path, text: str):
+        """Save extracted text so the next read of the same PDF skips extraction"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so readers never see partial text
+            tmp_path = cache_path.with_suffix(".tmp")
+            tmp_path.write_text(text, encoding="utf-8")
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache extracted text: {e}")
+
+    def _has_text_layer(self) -> bool:
+        """Cheap byte scan for font resources - scanned image-only PDFs have none"""
+        try:
+            with open(self.pdf_path, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Font dictionaries may sit inside compressed object streams,
+                # so only a file with neither marker is treated as image-only
+                return mm.find(b"/Font") != -1 or mm.find(b"/ObjStm") != -1
+        except (OSError, ValueError):
+            # Unreadable or empty file - let the extractors decide
+            return True
+
+    def _extract_text(self, doc=None) -> str:
         """Text extraction using multiple methods (fallback)"""
+        if not self._has_text_layer():
+            logger.warning("PDF has no font resources (image-only) - skipping text extraction")
+            return ""
 
         # Attempt 1: PyPDF2
         try:
@@ -114,7 +192,19 @@ class PDFReader:
         except Exception as e:
             logger.warning(f"PyPDF2 extraction failed: {e}")
 
-        # Attempt 2: pdfplumber
+        # Attempt 2: PyMuPDF - the document is already open, MuPDF is far
+        # faster than pdfminer, and it keeps Hebrew in logical order where
+        # pdfplumber returns visually reversed lines the parser cannot read
+        pymupdf_text = ""
+        try:
+            pymupdf_text = self._extract_with_pymupdf(doc)
+            if len(pymupdf_text.strip()) > 100:
+                logger.debug("Text extracted with PyMuPDF")
+                return self._sanitize_text(pymupdf_text)
+        except Exception as e:
+            logger.warning(f"PyMuPDF extraction failed: {e}")
+
+        # Attempt 3: pdfplumber
         try:
             text = self._extract_with_pdfplumber()
             if text and len(text.strip()) > 100:
@@ -123,14 +213,10 @@ class PDFReader:
         except Exception as e:
             logger.warning(f"pdfplumber extraction failed: {e}")
 
-        # Attempt 3: PyMuPDF
-        try:
-            text = self._extract_with_pymupdf()
-            if text:
-                logger.debug("Text extracted with PyMuPDF")
-                return self._sanitize_text(text)
-        except Exception as e:
-            logger.warning(f"PyMuPDF extraction failed: {e}")
+        # Last resort: accept whatever short text PyMuPDF found
+        if pymupdf_text:
+            logger.debug("Text extracted with PyMuPDF")
+            return self._sanitize_text(pymupdf_text)
 
         logger.error("All text extraction methods failed")
         return ""
@@ -147,46 +233,50 @@ class PDFReader:
 
     def _extract_with_pdfplumber(self) -> str:
         """Extraction using pdfplumber"""
+        # Imported lazily - this fallback is rarely reached and pdfminer is slow to load
+        import pdfplumber
+
         text_parts = []
         with pdfplumber.open(str(self.pdf_path)) as pdf:
             for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
+                try:
+                    page_text = page.extract_text()
+                    if page_text:
+                        text_parts.append(page_text)
+                finally:
+                    # Drop cached char objects so memory stays at one page
+                    page.flush_cache()
         return "\n".join(text_parts)
 
-    def _extract_with_pymupdf(self) -> str:
+    def _extract_with_pymupdf(self, doc) -> str:
         """Extraction using PyMuPDF"""
-        doc = fitz.open(str(self.pdf_path))
+        if doc is None:
+            raise ValueError("document could not be opened")
+
         text_parts = []
         for page in doc:
             text_parts.append(page.get_text())
-        doc.close()
         return "\n".join(text_parts)
 
-    def _get_page_count(self) -> int:
+    def _get_page_count(self, doc) -> int:
         """Get number of pages"""
-        try:
-            doc = fitz.open(str(self.pdf_path))
-            count = len(doc)
-            doc.close()
-            return count
-        except Exception:
+        if doc is None:
             return 1
+        return len(doc)
 
-    def _analyze_structure(self) -> List[PageStructure]:
-        """Analyze graphical structure of all pages"""
+    def _analyze_structure(self, doc) -> List[PageStructure]:
+        """Analyze graphical structure of the first pages (up to MAX_PAGES_FOR_STRUCTURE)"""
         structures = []
 
         try:
-            doc = fitz.open(str(self.pdf_path))
+            if doc is None:
+                raise ValueError("document could not be opened")
 
-            for page_num in range(len(doc)):
+            # Layout is taken from the first page - later pages repeat it
+            for page_num in range(min(len(doc), MAX_PAGES_FOR_STRUCTURE)):
                 structure = self._analyze_page_structure(doc, page_num)
                 structures.append(structure)
 
-            doc.close()
-
         except Exception as e:
             logger.error(f"Structure analysis failed: {e}")
 
@@ -380,10 +470,9 @@ class PDFReader:
         if not text:
             return ""
 
-        import re
-        text = text.replace("\r", " ").replace("\uFEFF", "").replace("\xa0", " ")
-        text = re.sub(r"[ \t]+", " ", text)
-        text = re.sub(r"\n{2,}", "\n", text)
+        text = text.translate(SANITIZE_TABLE)
+        text = Patterns.SPACES_RE.sub(" ", text)
+        text = NEWLINE_RUN_RE.sub("\n", text)
         return text.strip()
 
 
@@ -4,13 +4,13 @@ pdf_writer.py - Enhanced PDF Writer with Original Layout Preservation
 
 import logging
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
-from reportlab.lib.units import cm, inch
+from reportlab.lib.units import cm
 from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.enums import TA_RIGHT, TA_CENTER, TA_LEFT
+from reportlab.lib.enums import TA_CENTER
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
@@ -153,22 +153,6 @@ class PDFWriter:
 
         elements = []
 
-        # Styles
-        hebrew_style = ParagraphStyle(
-            'Hebrew',
-            fontName=base_font,
-            fontSize=base_font_size,
-            alignment=TA_RIGHT
-        )
-
-        title_style = ParagraphStyle(
-            'HebrewTitle',
-            fontName=header_font,
-            fontSize=header_font_size * 1.2,
-            alignment=TA_CENTER,
-            spaceAfter=15
-        )
-
         # ===== Top Table =====
         metadata = report.metadata
 
@@ -316,13 +300,6 @@ class PDFWriter:
         elements = []
 
         # Styles
-        hebrew_style = ParagraphStyle(
-            'Hebrew',
-            fontName=base_font,
-            fontSize=base_font_size,
-            alignment=TA_RIGHT
-        )
-
         title_style = ParagraphStyle(
             'HebrewTitle',
             fontName=header_font,